@@ -1,4 +1,6 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
+from itertools import chain
+
+from flask import Flask, Response, render_template, request, redirect, url_for, session, jsonify, stream_with_context
 
 import sr
 
@@ -41,11 +43,24 @@ def show_request(request_id):
     theme = session.get('theme', DEFAULT_THEME)
 
     try:
-        html_output = sr.generate_request(apiurl, str(request_id), theme)
-        return html_output
+        req = sr.fetch_request(apiurl, str(request_id))
+        stream = sr.stream_request(req, theme)
+        # Render the first chunk here, once it is sent an error can't change
+        # the status anymore
+        first_chunk = next(stream, "")
     except Exception as e:
         return f"<h2>Error processing request {request_id}:</h2><pre>{e}</pre>", 500
 
+    # Big diffs make for big pages, send them while they are rendered
+    response = Response(stream_with_context(chain([first_chunk], stream)), mimetype="text/html")
+
+    # Let proxies cache requests that won't change anymore, the page depends
+    # on the session too, Flask already sends a "Vary: Cookie" header for it
+    if req.is_final():
+        response.headers["Cache-Control"] = "public, max-age=60"
+
+    return response
+
 @app.route("/update_preferences", methods=["POST"])
 def update_preferences():
     """Endpoint to change preferences without reloading everything """
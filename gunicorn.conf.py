@@ -0,0 +1,11 @@
+# gunicorn settings for serving app.py in production, run with:
+#
+#   $ gunicorn app:app
+#
+# The application is loaded before forking, so sr.py compiles the templates
+# once in the master and the workers inherit them.
+preload_app = True
+
+workers = 4
+worker_class = "gthread"
+threads = 8
@@ -1,20 +1,65 @@
 #!/usr/bin/env python3
 
 import argparse
+import functools
 import logging
 import os
+import threading
+import time
 
-from collections import defaultdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from xml.etree import ElementTree as ET
+from operator import itemgetter
 
 import osc
-from jinja2 import Environment, FileSystemLoader
+import osc.connection
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from lxml import etree as ET
+from markupsafe import escape
 from osc.core import http_request
 
+# ciso8601 is optional, it parses timestamps much faster than the stdlib
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = datetime.fromisoformat
+
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
+# The OBS fetches are network bound, run them concurrently
+FETCH_WORKERS = 4
+executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+pool_lock = threading.Lock()
+
+# Diff and build results XML compress well, urllib3 decodes them on read
+HTTP_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
+# Build results that are not worth displaying
+SKIPPED_STATUS_CODES = frozenset(("excluded", "disabled"))
+
+# Requests in these states don't change anymore, declined isn't one of
+# them since OBS allows reopening the request
+FINAL_STATES = frozenset(("accepted", "superseded", "revoked"))
+
+
+def web_urls(base_url):
+    # package, project, build log, user, group and request pages
+    return (
+        f"{base_url}/package/show/",
+        f"{base_url}/project/show/",
+        f"{base_url}/package/live_build_log/",
+        f"{base_url}/users/",
+        f"{base_url}/groups/",
+        f"{base_url}/requests/",
+    )
+
+
+# Web UI links for the internal and the public build service
+SUSE_URLS = web_urls("https://build.suse.de")
+OPENSUSE_URLS = web_urls("https://build.opensuse.org")
+
 class RequestID:
 
     def __init__(self, rid, apiurl):
@@ -32,89 +77,159 @@ class RequestID:
         self.history = []  # This is self.reviews flattened and sorted
         self.issues = []
         self.file_diffs = []
+        self.lastupdate = None
+        self.incomplete = False  # Set when a response failed to parse
 
-        if "suse.de" in apiurl:
-            base_url = "https://build.suse.de"
-        else:
-            base_url = "https://build.opensuse.org"
+        (
+            self.package_url,
+            self.project_url,
+            self.build_url,
+            self.user_url,
+            self.group_url,
+            self.external_url,
+        ) = SUSE_URLS if "suse.de" in apiurl else OPENSUSE_URLS
 
-        self.package_url = f"{base_url}/package/show/"
-        self.project_url = f"{base_url}/project/show/"
-        self.build_url = f"{base_url}/package/live_build_log/"
-        self.user_url = f"{base_url}/users/"
-        self.group_url = f"{base_url}/groups/"
-        self.external_url = f"{base_url}/requests/"
+    def is_final(self):
+        return self.state.get("name") in FINAL_STATES
 
-def parse_request_xml(req, root):
 
-    if root is None:
+class RequestCache:
+    """LRU cache of the parsed requests, the ones still in progress expire after ttl seconds"""
+
+    def __init__(self, maxsize=512, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            req, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return req
+
+    def put(self, key, req):
+        expires = None if req.is_final() else time.monotonic() + self.ttl
+        with self.lock:
+            self.entries[key] = (req, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+request_cache = RequestCache()
+
+
+def child_attrib(parent, tag):
+    """Return the attributes of the first <tag> child, empty if there is none"""
+    child = parent.find(tag)
+    return child.attrib if child is not None else {}
+
+
+def parse_request_xml(req, f):
+
+    if f is None:
         return
 
-    req.creator = root.attrib.get("creator")
-    req.description = root.findtext("description", default="")
-
-    # Parse <action>
-    action_elem = root.find("action")
-    if action_elem is not None:
-        source = action_elem.find("source")
-        target = action_elem.find("target")
-        req.action = {
-            "type": action_elem.attrib.get("type"),
-            "source_project": (
-                source.attrib.get("project") if source is not None else None
-            ),
-            "source_package": (
-                source.attrib.get("package") if source is not None else None
-            ),
-            "source_rev": source.attrib.get("rev") if source is not None else None,
-            "target_project": (
-                target.attrib.get("project") if target is not None else None
-            ),
-            "target_package": (
-                target.attrib.get("package") if target is not None else None
-            ),
-        }
+    req.description = ""
+    review_history = []
+    staging = None
 
-    # Parse <state>
-    state_elem = root.find("state")
-    if state_elem is not None:
-        req.state = {
-            "name": state_elem.attrib.get("name"),
-            "who": state_elem.attrib.get("who"),
-            "when": state_elem.attrib.get("when"),
-            "created": state_elem.attrib.get("created"),
-            "created_utc": datetime.fromisoformat(
-                state_elem.attrib.get("created")
-            ).replace(tzinfo=timezone.utc),
-            "comment": state_elem.findtext("comment", default=""),
-        }
-        if req.state["name"] == "superseded":
-            req.state["superseded_by"] = state_elem.attrib.get("superseded_by")
-
-    # Parse <review>, and <history>
-    for review_elem in root.findall("review"):
-        review = {
-            "state": review_elem.attrib.get("state"),
-            "when": review_elem.attrib.get("when"),
-            "who": review_elem.attrib.get("who"),
-            "by_user": review_elem.attrib.get("by_user"),
-            "by_group": review_elem.attrib.get("by_group"),
-            "by_project": review_elem.attrib.get("by_project"),
-            "comment": review_elem.findtext("comment", default=""),
-            "history": [],
-        }
+    # Walk the request in a single pass, only the direct children of
+    # <request> are handled, apart from the <history> of each <review>
+    context = ET.iterparse(f, events=("end",), collect_ids=False,
+                           tag=("action", "state", "review", "history", "description"))
+    try:
+        for _, elem in context:
+            parent = elem.getparent()
+
+            # Parse <history>, it's attached to the <review> when it ends
+            if elem.tag == "history" and parent.tag == "review":
+                review_history.append(
+                    {
+                        "who": elem.get("who"),
+                        "when": parse_datetime(elem.get("when")),
+                        "description": elem.findtext("description", default=""),
+                        "comment": elem.findtext("comment", default=""),
+                    }
+                )
+                continue
+
+            if parent.getparent() is not None:
+                continue
 
-        for hist in review_elem.findall("history"):
-            review["history"].append(
-                {
-                    "who": hist.attrib.get("who"),
-                    "when": hist.attrib.get("when"),
-                    "description": hist.findtext("description", default=""),
-                    "comment": hist.findtext("comment", default=""),
+            # Parse <action>
+            if elem.tag == "action" and not req.action:
+                source = child_attrib(elem, "source")
+                target = child_attrib(elem, "target")
+                req.action = {
+                    "type": elem.get("type"),
+                    "source_project": source.get("project"),
+                    "source_package": source.get("package"),
+                    "source_rev": source.get("rev"),
+                    "target_project": target.get("project"),
+                    "target_package": target.get("package"),
                 }
-            )
 
-        req.reviews.append(review)
+            # Parse <state>
+            elif elem.tag == "state":
+                req.state = {
+                    "name": elem.get("name"),
+                    "who": elem.get("who"),
+                    "when": elem.get("when"),
+                    "created": elem.get("created"),
+                    "created_utc": parse_datetime(
+                        elem.get("created")
+                    ).replace(tzinfo=timezone.utc),
+                    "comment": elem.findtext("comment", default=""),
+                }
+                if req.state["name"] == "superseded":
+                    req.state["superseded_by"] = elem.get("superseded_by")
+
+            # Parse <review>
+            elif elem.tag == "review":
+                req.reviews.append(
+                    {
+                        "state": elem.get("state"),
+                        "when": elem.get("when"),
+                        "who": elem.get("who"),
+                        "by_user": elem.get("by_user"),
+                        "by_group": elem.get("by_group"),
+                        "by_project": elem.get("by_project"),
+                        "comment": elem.findtext("comment", default=""),
+                        "history": review_history,
+                    }
+                )
+                review_history = []
+
+                by_project = elem.get("by_project")
+                if by_project and "openSUSE:Factory:Staging" in by_project:
+                    staging = by_project
+
+            elif elem.tag == "description":
+                req.description = elem.text or ""
+
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+        req.creator = context.root.get("creator")
+    except Exception as e:
+        logger.error(f"Failed to parse request {req.rid}: {e}")
+        req.incomplete = True
+        return
+
+    # if it's not accepted and staged, set the staging project
+    if req.state["name"] not in ["accepted", "superseded"]:
+        req.staging = staging
 
     # Get name of the package
     if req.staging:
@@ -122,41 +237,20 @@ def parse_request_xml(req, root):
     else:
         req.package = req.action.get('source_package')
 
-    # Order reviews in a history
-    req.history = []
-
-    for review in req.reviews:
-        for event in review.get("history", []):
-            req.history.append(
-                {
-                    "who": event["who"],
-                    "when": datetime.fromisoformat(event["when"]),
-                    "description": event["description"],
-                    "comment": event["comment"],
-                }
-            )
-
-    # Sort by 'when'
-    req.history.sort(key=lambda x: x["when"])
-
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
-    for h in req.history:
-        delta = now - h["when"]
-        if delta.days > 0:
-            h["timestamp_relative"] = f"{delta.days} days ago"
-        else:
-            h["timestamp_relative"] = (
-                f"{int(delta.total_seconds() // 3600)} hours ago"
-            )
-
-
-    # if it's not accepted and staged, set the staging project
-    req.staging = None
-    if req.state["name"] not in ["accepted", "superseded"]:
-        for review in req.reviews:
-            by_project = review.get("by_project")
-            if by_project and "openSUSE:Factory:Staging" in by_project:
-                req.staging = by_project
+    # Order reviews in a history, sorted by 'when'
+    req.history = sorted(
+        (
+            {
+                "who": event["who"],
+                "when": event["when"],
+                "description": event["description"],
+                "comment": event["comment"],
+            }
+            for review in req.reviews
+            for event in review["history"]
+        ),
+        key=itemgetter("when"),
+    )
 
 
 def parse_comments_request_xml(req, root):
@@ -166,18 +260,18 @@ def parse_comments_request_xml(req, root):
 
     for comment_elem in root.findall("comment"):
         comment_data = {
-            "id": comment_elem.attrib.get("id"),
-            "who": comment_elem.attrib.get("who"),
-            "when": comment_elem.attrib.get("when"),
-            "parent": comment_elem.attrib.get("parent"),
+            "id": comment_elem.get("id"),
+            "who": comment_elem.get("who"),
+            "when": comment_elem.get("when"),
+            "parent": comment_elem.get("parent"),
             "text": comment_elem.text.strip() if comment_elem.text else "",
         }
         req.comments.append(comment_data)
 
 
-def parse_request_diff_and_issues_xml(req, root):
+def parse_request_diff_and_issues_xml(req, f):
 
-    if root is None:
+    if f is None:
         return
 
     # in this type of action there are not diff or issues
@@ -187,64 +281,67 @@ def parse_request_diff_and_issues_xml(req, root):
     issues = []
     diff_files = []
 
-    for action_elem in root.findall("action"):
-        sourcediff_elem = action_elem.find("sourcediff")
-
-        for file_elem in sourcediff_elem.findall(".//file"):
-            file_data = {
-                "state": file_elem.attrib.get("state"),
-                "name_old": "",
-                "name_new": "",
-            }
-
-            old_elem = file_elem.find("old")
-            if old_elem is not None:
-                file_data["name_old"] = old_elem.attrib.get("name", "")
+    # The diff document embeds the full patches, walk it incrementally and
+    # drop every <file> and <issue> once parsed to keep memory usage flat
+    try:
+        for _, elem in ET.iterparse(f, events=("end",), tag=("file", "issue"),
+                                    huge_tree=True, collect_ids=False):
+            if elem.tag == "file":
+                file_data = {
+                    "state": elem.get("state"),
+                    "name_old": child_attrib(elem, "old").get("name", ""),
+                    "name_new": child_attrib(elem, "new").get("name", ""),
+                }
 
-            new_elem = file_elem.find("new")
-            if new_elem is not None:
-                file_data["name_new"] =  new_elem.attrib.get("name", "")
+                diff_elem = elem.find("diff")
+                if diff_elem is not None:
+                    # Escape the patch once here, not on every render of a cached request
+                    file_data["content"] = escape(diff_elem.text.strip()) if diff_elem.text else ""
+
+                # add rename state
+                if file_data["name_old"] and file_data["name_new"] and file_data["name_old"] != file_data["name_new"]:
+                    file_data["state"] = "renamed"
+
+                # Display name for diff files
+                if file_data["name_old"] and file_data["name_new"]:
+                    if file_data["name_old"] == file_data["name_new"]:
+                        file_data["display_name"] = file_data["name_new"]
+                    else:
+                        file_data["display_name"] = f"{file_data['name_old']} → {file_data['name_new']}"
+                else:
+                    file_data["display_name"] = file_data["name_new"] or file_data["name_old"]
 
-            diff_elem = file_elem.find("diff")
-            if diff_elem is not None:
-                file_data["content"] = diff_elem.text.strip() if diff_elem.text else ""
+                name = file_data["name_new"] or file_data["name_old"]
+                if name.endswith(".changes"):
+                    file_data["sort_priority"] = 0
+                elif name.endswith(".spec"):
+                    file_data["sort_priority"] = 1
+                else:
+                    file_data["sort_priority"] = 2
 
-            # add rename state
-            if file_data["name_old"] and file_data["name_new"] and file_data["name_old"] != file_data["name_new"]:
-                file_data["state"] = "renamed"
+                diff_files.append(file_data)
 
-            # Display name for diff files
-            if file_data["name_old"] and file_data["name_new"]:
-                if file_data["name_old"] == file_data["name_new"]:
-                    file_data["display_name"] = file_data["name_new"]
-                else:
-                    file_data["display_name"] = f"{file_data['name_old']} → {file_data['name_new']}"
             else:
-                file_data["display_name"] = file_data["name_new"] or file_data["name_old"]
-
-            diff_files.append(file_data)
-
-        # <issues>
-        for issue_elem in sourcediff_elem.findall(".//issue"):
-            issue_data = {
-                "state": issue_elem.attrib.get("state"),
-                "tracker": issue_elem.attrib.get("tracker"),
-                "name": issue_elem.attrib.get("name"),
-                "label": issue_elem.attrib.get("label"),
-                "url": issue_elem.attrib.get("url"),
-            }
-            issues.append(issue_data)
+                # <issues>
+                issue_data = {
+                    "state": elem.get("state"),
+                    "tracker": elem.get("tracker"),
+                    "name": elem.get("name"),
+                    "label": elem.get("label"),
+                    "url": elem.get("url"),
+                }
+                issues.append(issue_data)
 
-    # Sort the diff_files list: .changes first, then .spec, then the rest
-    def sort_priority(filename):
-        if filename.endswith(".changes"):
-            return 0
-        elif filename.endswith(".spec"):
-            return 1
-        else:
-            return 2
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    except Exception as e:
+        logger.error(f"Failed to parse the diff of request {req.rid}: {e}")
+        req.incomplete = True
+        return
 
-    diff_files.sort(key=lambda f: sort_priority(f.get("name_new") or f.get("name_old", "")))
+    # Sort the diff_files list: .changes first, then .spec, then the rest
+    diff_files.sort(key=itemgetter("sort_priority"))
 
     req.issues = issues
     req.file_diffs = diff_files
@@ -255,48 +352,36 @@ def parse_results_xml(req, root):
     if root is None:
         return
 
-    parsed_results = []
     pkg = req.package
+    pkg_prefix = pkg + ":"
+
+    # Nested dict: package → repo → arch → list of result dicts
+    req.results = {}
 
     for result in root.findall("result"):
 
-        result_attrs = {
-            # "project": result.attrib["project"], - not needed
-            "repository": result.attrib["repository"],
-            "arch": result.attrib["arch"],
-            "code": result.attrib["code"],
-            "state": result.attrib["state"]
-        }
+        # "project": result.get("project"), - not needed
+        repo = result.get("repository")
+        arch = result.get("arch")
+        code = result.get("code")
+        state = result.get("state")
 
         for status in result.findall("status"):
-            if status.attrib["package"] == pkg or status.attrib["package"].startswith(pkg+":"):
-                # Flatten status data into top-level dict, rename 'code' to 'status_code'
-                parsed_results.append({
-                    **result_attrs,
-                    "package": status.attrib["package"],
-                    "status_code": status.attrib["code"],
-                    "details": status.findtext("details")
-                })
-            else:
+            package = status.get("package")
+            if package != pkg and not package.startswith(pkg_prefix):
                 continue
 
-    # Nested dict: package → repo → arch → list of result dicts
-    grouped = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-    for entry in parsed_results:
-        package = entry["package"]
-        repo = entry["repository"]
-        arch = entry["arch"]
-        if entry["status_code"] not in ["excluded", "disabled"]:
-            grouped[package][repo][arch].append({
-                                'code': entry["code"],
-                                'details': entry["details"],
-                                'state': entry["state"],
-                                'status_code': entry["status_code"]
-                                })
+            # Rename the status 'code' to 'status_code'
+            status_code = status.get("code")
+            if status_code in SKIPPED_STATUS_CODES:
+                continue
 
-    # Convert to regular dicts for jinja2
-    req.results = {pkg: {repo: dict(archs) for repo, archs in repos.items()}
-                   for pkg, repos in grouped.items()}
+            req.results.setdefault(package, {}).setdefault(repo, {}).setdefault(arch, []).append({
+                                'code': code,
+                                'details': status.findtext("details"),
+                                'state': state,
+                                'status_code': status_code
+                                })
 
     if req.staging:
         # Prefer order for repositories
@@ -316,63 +401,179 @@ def parse_results_xml(req, root):
             req.results[package] = ordered_repos
 
 
-def fetch_xml(method, url):
+def widen_connection_pool(url):
+    """Let the osc pool of the apiurl keep one idle connection per fetch worker"""
+    # osc creates it with urllib3's default of a single idle connection, any
+    # other connection used by the concurrent fetches is discarded on release
+    pool = osc.connection.CONNECTION_POOLS.get(osc.conf.extract_known_apiurl(url))
+    if pool is None or pool.pool is None:
+        return
+
+    # The pool doesn't block, an empty queue already means a new connection,
+    # so there is no need to add placeholders for the extra slots
+    with pool_lock:
+        if pool.pool.maxsize < FETCH_WORKERS:
+            pool.pool.maxsize = FETCH_WORKERS
+
+
+def fetch_xml_stream(method, url):
+    """Return the response file object, to be parsed incrementally"""
     try:
-        f = http_request(method, url)
-        return ET.parse(f).getroot()
+        f = http_request(method, url, headers=HTTP_HEADERS)
     except Exception as e:
         logger.error(f"Failed to fetch {url}: {e}")
         return None
 
+    # osc only creates the pool on the first request to the apiurl
+    widen_connection_pool(url)
+    return f
+
+
+def release_response(f):
+    """Give the connection back to the osc keep-alive pool"""
+    # urllib3 does it by itself once the body is read to the end, but a
+    # parser returning early leaves unread data that blocks the connection
+    f.drain_conn()
+    f.release_conn()
+
+
+def fetch_xml(method, url):
+    f = fetch_xml_stream(method, url)
+    if f is None:
+        return None
+
+    # lxml parsers must not be shared between threads, create one per fetch
+    parser = ET.XMLParser(collect_ids=False)
+    try:
+        return ET.parse(f, parser).getroot()
+    except Exception as e:
+        logger.error(f"Failed to parse {url}: {e}")
+        return None
+    finally:
+        release_response(f)
+
+
+def relative_time(when, now):
+    """Jinja2 filter, how long ago a naive UTC datetime was compared to now"""
+    hours = int((now - when).total_seconds() // 3600)
+    if hours >= 24:
+        return f"{hours // 24} days ago"
+    return f"{hours} hours ago"
+
 
 def path_dir(directory):
     script_dir = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(script_dir, directory)
 
 
-def generate_request(apiurl="https://api.opensuse.org", request_id="1", theme="light", standalone=False):
-
-    # output and templates dir are relative to where the script is running
+# Build the jinja2 environment once, templates are compiled on first load and
+# the bytecode is kept on disk so it survives process restarts
+env = Environment(
+    loader=FileSystemLoader(path_dir("templates")),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=50,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+env.filters["relative_time"] = relative_time
+request_template = env.get_template("request.html")
 
-    templates_dir = path_dir("templates")
 
+@functools.lru_cache(maxsize=8)
+def load_osc_config(apiurl):
+    # The oscrc holds the options of every API, read it once per apiurl
     osc.conf.get_config(override_apiurl=apiurl)
 
+
+def fetch_request(apiurl="https://api.opensuse.org", request_id="1"):
+
+    req = request_cache.get((apiurl, request_id))
+    if req is not None:
+        return req
+
+    load_osc_config(apiurl)
+
     req = RequestID(request_id, apiurl)
 
-    # Get the basic SR data
-    root = fetch_xml("GET", f"{apiurl}/request/{request_id}")
-    parse_request_xml(req, root)
+    # The request, comments and diff fetches are independent, issue them at once
+    request_future = executor.submit(fetch_xml_stream, "GET", f"{apiurl}/request/{request_id}")
+    comments_future = executor.submit(fetch_xml, "GET", f"{apiurl}/comments/request/{request_id}")
+    diff_future = executor.submit(fetch_xml_stream, "POST", f"{apiurl}/request/{request_id}?cmd=diff&view=xml&withissues=1")
+
+    try:
+        # Get the basic SR data
+        responses = [request_future.result()]
+        parse_request_xml(req, responses[0])
+
+        # Nothing can be shown without the request itself
+        if responses[0] is None or req.incomplete:
+            raise RuntimeError(f"Failed to get request {request_id} from {apiurl}")
+
+        # Get build information, it depends on the staging and source project, so
+        # issue it now while the comments and diff are still in flight
+        build_future = None
+        if req.action.get('type') == "submit":
+            if req.staging:
+                build_project = req.staging
+            else:
+                # When SR is accepted or not staged, use source project
+                build_project = req.action['source_project']
+
+            build_future = executor.submit(fetch_xml, "GET", f"{apiurl}/build/{build_project}/_result")
+
+        # Get the comments
+        responses.append(comments_future.result())
+        parse_comments_request_xml(req, responses[-1])
+
+        # Get diff and mentioned issues
+        responses.append(diff_future.result())
+        parse_request_diff_and_issues_xml(req, responses[-1])
 
-    # Get the comments
-    root = fetch_xml("GET", f"{apiurl}/comments/request/{request_id}")
-    parse_comments_request_xml(req, root)
+        if build_future is not None:
+            responses.append(build_future.result())
+            parse_results_xml(req, responses[-1])
+    finally:
+        # The parsers only read the streamed responses, release them here
+        # whether they were parsed, skipped or abandoned by a failure
+        for future in (request_future, diff_future):
+            f = future.result()
+            if f is not None:
+                release_response(f)
 
-    # Get diff and mentioned issues
-    root = fetch_xml("POST", f"{apiurl}/request/{request_id}?cmd=diff&view=xml&withissues=1")
-    parse_request_diff_and_issues_xml(req, root)
+    req.lastupdate = datetime.now(timezone.utc)
 
-    # Get build information
-    if req.action['type'] == "submit":
-        if req.staging:
-            root = fetch_xml("GET", f"{apiurl}/build/{req.staging}/_result")
-        else:
-            # When SR is accepted or not staged, use source project
-            root = fetch_xml("GET", f"{apiurl}/build/{req.action["source_project"]}/_result")
+    # Don't keep incomplete data around
+    if None not in responses and not req.incomplete:
+        request_cache.put((apiurl, request_id), req)
 
-        parse_results_xml(req, root)
+    return req
 
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=True)
-    template = env.get_template("request.html")
 
-    rendered = template.render(
-        lastupdate=datetime.now(timezone.utc),
+def stream_request(req, theme="light", standalone=False):
+
+    # Requests are cached, ages must be computed when rendering
+    stream = request_template.stream(
+        now=datetime.now(timezone.utc).replace(tzinfo=None),
+        lastupdate=req.lastupdate,
         user_theme = theme,
         standalone = 1 if standalone == True else 0,
         request=req
     )
 
-    return rendered
+    # Send the page in a few larger chunks rather than many tiny ones
+    stream.enable_buffering(size=5)
+
+    return stream
+
+
+def render_request(req, theme="light", standalone=False):
+
+    return "".join(stream_request(req, theme, standalone))
+
+
+def generate_request(apiurl="https://api.opensuse.org", request_id="1", theme="light", standalone=False):
+
+    return render_request(fetch_request(apiurl, request_id), theme, standalone)
 
 
 if __name__ == "__main__":